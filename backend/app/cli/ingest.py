@@ -0,0 +1,340 @@
+"""Bulk document ingestion
+
+Usage:
+    python -m app.cli.ingest <dir | glob | file.zip | file.tar.gz> [...] [options]
+
+Text extraction and chunking fan out across a process pool, embeddings are
+generated in batched async OpenAI calls, and chunks are written to Redis
+with pipelines. Completed files are appended to a checkpoint file so a
+restarted run skips them.
+"""
+import argparse
+import asyncio
+import glob
+import logging
+import os
+import tarfile
+import tempfile
+import time
+import uuid
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Set
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from app.config import settings
+from app.services.document_service import DocumentService
+from app.services.redis_service import DEFAULT_COLLECTION, validate_collection
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".txt"}
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+@dataclass
+class Source:
+    key: str        # Stable identifier used for checkpointing and file_id generation
+    path: str       # Location of the file on local disk
+    filename: str   # Display name stored with the document
+    temporary: bool = False  # Extracted from an archive; deleted once chunked
+
+    @property
+    def file_id(self) -> str:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, self.key))
+
+@dataclass
+class ExtractedFile:
+    source: Source
+    chunks: List[str]
+
+class Checkpoint:
+    """Append-only record of source keys that have been fully indexed"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Set[str] = set()
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                self.done = {line.rstrip("\n") for line in file if line.strip()}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.done
+
+    def mark(self, keys: List[str]):
+        self.done.update(keys)
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.writelines(f"{key}\n" for key in keys)
+
+def _is_supported(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in SUPPORTED_EXTENSIONS
+
+def _is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+# Corrupt, truncated, encrypted (RuntimeError) or unsafe (tarfile.FilterError) archives
+ARCHIVE_ERRORS = (zipfile.BadZipFile, tarfile.TarError, OSError, EOFError, zlib.error, RuntimeError)
+
+def _extract_archive(archive_path: str, target_dir: str, is_done: Callable[[str], bool],
+                     on_error: Callable[[str, Exception], None]) -> Iterator[Source]:
+    """Unpack supported members of a ZIP or TAR archive one at a time, skipping checkpointed ones
+
+    A bad member is reported and skipped; a bad archive ends only its own members.
+    """
+    archive_name = os.path.abspath(archive_path)
+
+    try:
+        if zipfile.is_zipfile(archive_path):
+            with zipfile.ZipFile(archive_path) as archive:
+                for member in archive.namelist():
+                    if member.endswith("/") or not _is_supported(member):
+                        continue
+                    key = f"{archive_name}!{member}"
+                    if is_done(key):
+                        continue
+                    try:
+                        path = archive.extract(member, target_dir)
+                    except ARCHIVE_ERRORS as e:
+                        on_error(key, e)
+                        continue
+                    yield Source(key=key, path=path, filename=os.path.basename(member), temporary=True)
+        else:
+            with tarfile.open(archive_path) as archive:
+                for member in archive:
+                    if not member.isfile() or not _is_supported(member.name):
+                        continue
+                    key = f"{archive_name}!{member.name}"
+                    if is_done(key):
+                        continue
+                    try:
+                        archive.extract(member, target_dir, filter="data")
+                    except ARCHIVE_ERRORS as e:
+                        on_error(key, e)
+                        continue
+                    yield Source(
+                        key=key,
+                        path=os.path.join(target_dir, member.name),
+                        filename=os.path.basename(member.name),
+                        temporary=True
+                    )
+    except ARCHIVE_ERRORS as e:
+        on_error(archive_name, e)
+
+def _discover(inputs: List[str], work_dir: str, is_done: Callable[[str], bool],
+              on_error: Callable[[str, Exception], None]) -> Iterator[Source]:
+    """Expand directories, globs and archives into sources not yet in the checkpoint"""
+    for entry in inputs:
+        if os.path.isdir(entry):
+            paths = sorted(glob.glob(os.path.join(entry, "**", "*"), recursive=True))
+        elif os.path.exists(entry):
+            paths = [entry]
+        else:
+            paths = sorted(glob.glob(entry, recursive=True))
+            if not paths:
+                logger.warning(f"No files match {entry}")
+
+        for path in paths:
+            if not os.path.isfile(path):
+                continue
+            if _is_archive(path):
+                yield from _extract_archive(path, tempfile.mkdtemp(dir=work_dir), is_done, on_error)
+            elif _is_supported(path):
+                path = os.path.abspath(path)
+                if is_done(path):
+                    continue
+                yield Source(key=path, path=path, filename=os.path.basename(path))
+
+def _extract_chunks(path: str) -> List[str]:
+    """Extract and chunk a single file (runs in a worker process)"""
+    service = DocumentService(connect=False)
+    return service._create_chunks(service._extract_text(path))
+
+class BulkIngester:
+    def __init__(self, openai_api_key: str, processes: int, workers: int, batch_size: int,
+                 checkpoint: Checkpoint, collection: str = DEFAULT_COLLECTION):
+        self.openai_api_key = openai_api_key
+        self.collection = collection
+        self.processes = processes
+        self.workers = workers
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.document_service = DocumentService()
+        self.openai_client: Optional[AsyncOpenAI] = None
+        self.stats = {"indexed": 0, "skipped": 0, "empty": 0, "failed": 0, "chunks": 0}
+
+    async def run(self, sources: Iterator[Source]):
+        """Run extraction, embedding and storage stages concurrently"""
+        file_queue: asyncio.Queue = asyncio.Queue(maxsize=self.processes * 4)
+        batch_queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 2)
+        # One client (and connection pool) shared by all embedding workers
+        self.openai_client = AsyncOpenAI(api_key=self.openai_api_key)
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.processes) as pool:
+                extractors = [asyncio.create_task(self._extractor(sources, pool, file_queue))
+                              for _ in range(self.processes)]
+                batcher = asyncio.create_task(self._batcher(file_queue, batch_queue))
+                embedders = [asyncio.create_task(self._embedder(batch_queue))
+                             for _ in range(self.workers)]
+
+                await asyncio.gather(*extractors)
+                await file_queue.put(None)
+                await batcher
+                for _ in embedders:
+                    await batch_queue.put(None)
+                await asyncio.gather(*embedders)
+        finally:
+            await self.openai_client.close()
+
+    def is_done(self, key: str) -> bool:
+        """Checkpoint lookup used during discovery; counts skipped sources"""
+        if key in self.checkpoint:
+            self.stats["skipped"] += 1
+            return True
+        return False
+
+    def on_discovery_error(self, key: str, error: Exception):
+        """Record an archive or member that could not be unpacked and carry on"""
+        logger.error(f"Error unpacking {key}: {error}")
+        self.stats["failed"] += 1
+
+    async def _extractor(self, sources: Iterator[Source], pool: ProcessPoolExecutor,
+                         file_queue: asyncio.Queue):
+        """Pull sources from the shared iterator and chunk them in the process pool"""
+        loop = asyncio.get_running_loop()
+        for source in sources:
+            try:
+                chunks = await loop.run_in_executor(pool, _extract_chunks, source.path)
+            except Exception as e:
+                logger.error(f"Error extracting {source.key}: {e}")
+                self.stats["failed"] += 1
+                continue
+            finally:
+                if source.temporary:
+                    os.remove(source.path)
+
+            if not chunks:
+                self.stats["empty"] += 1
+                self.checkpoint.mark([source.key])
+                continue
+
+            await file_queue.put(ExtractedFile(source=source, chunks=chunks))
+
+    async def _batcher(self, file_queue: asyncio.Queue, batch_queue: asyncio.Queue):
+        """Group extracted files so each embedding call carries about batch_size chunks"""
+        batch: List[ExtractedFile] = []
+        batch_chunks = 0
+        while True:
+            extracted = await file_queue.get()
+            if extracted is None:
+                break
+            batch.append(extracted)
+            batch_chunks += len(extracted.chunks)
+            if batch_chunks >= self.batch_size:
+                await batch_queue.put(batch)
+                batch, batch_chunks = [], 0
+        if batch:
+            await batch_queue.put(batch)
+
+    async def _embedder(self, batch_queue: asyncio.Queue):
+        """Embed and store batches, then record the files in the checkpoint"""
+        while True:
+            batch = await batch_queue.get()
+            if batch is None:
+                break
+            try:
+                await self._index_batch(batch)
+            except Exception as e:
+                logger.error(f"Error indexing batch of {len(batch)} files: {e}")
+                self.stats["failed"] += len(batch)
+                continue
+
+            self.checkpoint.mark([extracted.source.key for extracted in batch])
+            self.stats["indexed"] += len(batch)
+            self.stats["chunks"] += sum(len(extracted.chunks) for extracted in batch)
+            logger.info(f"Indexed {self.stats['indexed']} files ({self.stats['chunks']} chunks)")
+
+    async def _index_batch(self, batch: List[ExtractedFile]):
+        texts = [chunk for extracted in batch for chunk in extracted.chunks]
+
+        # Large single files can exceed the batch size, so split the API calls
+        embeddings = []
+        for start in range(0, len(texts), self.batch_size):
+            embeddings.extend(await self.document_service.generate_embeddings(
+                texts[start:start + self.batch_size], self.openai_client
+            ))
+
+        documents = []
+        offset = 0
+        for extracted in batch:
+            count = len(extracted.chunks)
+            documents.append({
+                "file_id": extracted.source.file_id,
+                "filename": extracted.source.filename,
+                "chunks": extracted.chunks,
+                "embeddings": embeddings[offset:offset + count]
+            })
+            offset += count
+
+        await self.document_service.store_documents_batch(documents, self.collection)
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk ingest documents into the vector index")
+    parser.add_argument("inputs", nargs="+", help="Directories, glob patterns, files or ZIP/TAR archives")
+    parser.add_argument("--openai-api-key", default=os.getenv("OPENAI_API_KEY"),
+                        help="OpenAI API key (defaults to OPENAI_API_KEY)")
+    parser.add_argument("--collection", default=DEFAULT_COLLECTION, help="Collection to ingest into")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for text extraction")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent embedding workers")
+    parser.add_argument("--batch-size", type=int, default=128, help="Chunks per embedding request")
+    parser.add_argument("--checkpoint", default=None,
+                        help="Checkpoint file of completed sources (defaults to .ingest_checkpoint, "
+                             "suffixed with the collection name; '' to disable)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    load_dotenv()
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    args = _parse_args(argv)
+
+    try:
+        collection = validate_collection(args.collection)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+
+    checkpoint_path = args.checkpoint
+    if checkpoint_path is None:
+        checkpoint_path = ".ingest_checkpoint"
+        if collection != DEFAULT_COLLECTION:
+            checkpoint_path += f".{collection}"
+
+    if not args.openai_api_key:
+        logger.error("An OpenAI API key is required (--openai-api-key or OPENAI_API_KEY)")
+        return 2
+
+    ingester = BulkIngester(
+        openai_api_key=args.openai_api_key,
+        processes=max(1, args.processes),
+        workers=max(1, args.workers),
+        batch_size=max(1, args.batch_size),
+        checkpoint=Checkpoint(checkpoint_path or None),
+        collection=collection
+    )
+
+    started = time.monotonic()
+    with tempfile.TemporaryDirectory(prefix="ingest-") as work_dir:
+        asyncio.run(ingester.run(_discover(args.inputs, work_dir, ingester.is_done, ingester.on_discovery_error)))
+
+    logger.info(f"Ingestion finished in {time.monotonic() - started:.1f}s: {ingester.stats}")
+    return 1 if ingester.stats["failed"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,256 @@
+"""Index snapshot export/import
+
+Usage:
+    python -m app.cli.snapshot export <snapshot_dir> [--collection NAME]
+    python -m app.cli.snapshot import <snapshot_dir> [--collection NAME]
+
+A snapshot is a directory holding:
+    manifest.json         format version, collection, row count and vector dims
+    vectors.f32           row-major float32 array of shape (count, dims), memory-mappable
+    <column>.bin          UTF-8 values of a string column, concatenated
+    <column>.offsets.npy  int64 end offsets into <column>.bin, one per row
+    chunk_index.npy       int32 chunk indexes
+    documents.json        document metadata hashes
+
+Import loads chunks straight from the snapshot with pipelines and makes no
+embedding calls.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+from dotenv import load_dotenv
+
+from app.config import settings
+from app.services.redis_service import (
+    DEFAULT_COLLECTION,
+    get_binary_redis_client,
+    get_collection_keys,
+    get_redis_client,
+    get_vector_index,
+    validate_collection,
+)
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+STRING_COLUMNS = ["chunk_id", "file_id", "filename", "content"]
+
+class StringColumnWriter:
+    """Append-only writer for a UTF-8 string column"""
+
+    def __init__(self, directory: str, name: str):
+        self.directory = directory
+        self.name = name
+        self.file = open(os.path.join(directory, f"{name}.bin"), "wb")
+        self.offsets: List[int] = []
+        self.position = 0
+
+    def append(self, value: str):
+        data = value.encode("utf-8")
+        self.file.write(data)
+        self.position += len(data)
+        self.offsets.append(self.position)
+
+    def close(self):
+        self.file.close()
+        np.save(os.path.join(self.directory, f"{self.name}.offsets.npy"),
+                np.array(self.offsets, dtype=np.int64))
+
+class StringColumnReader:
+    """Random-access reader for a column written by StringColumnWriter"""
+
+    def __init__(self, directory: str, name: str):
+        data_path = os.path.join(directory, f"{name}.bin")
+        # np.memmap cannot map an empty file
+        if os.path.getsize(data_path):
+            self.data = np.memmap(data_path, dtype=np.uint8, mode="r")
+        else:
+            self.data = np.empty(0, dtype=np.uint8)
+        self.offsets = np.load(os.path.join(directory, f"{name}.offsets.npy"))
+
+    def __getitem__(self, row: int) -> str:
+        start = int(self.offsets[row - 1]) if row else 0
+        return self.data[start:int(self.offsets[row])].tobytes().decode("utf-8")
+
+def _decode(value: bytes) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+def export_snapshot(path: str, collection: str = DEFAULT_COLLECTION, batch_size: int = 1000) -> Dict[str, int]:
+    """Stream a collection's chunks and document metadata into a snapshot directory"""
+    keys = get_collection_keys(collection)
+    client = get_binary_redis_client()
+    os.makedirs(path, exist_ok=True)
+
+    columns = {name: StringColumnWriter(path, name) for name in STRING_COLUMNS}
+    chunk_indexes: List[int] = []
+    dims: Optional[int] = None
+    count = 0
+
+    with open(os.path.join(path, "vectors.f32"), "wb") as vectors:
+        batch: List[bytes] = []
+
+        def flush():
+            nonlocal dims, count
+            pipeline = client.pipeline(transaction=False)
+            for key in batch:
+                pipeline.hgetall(key)
+
+            for key, fields in zip(batch, pipeline.execute()):
+                if not fields or b"embedding" not in fields:
+                    continue
+
+                embedding = np.frombuffer(fields[b"embedding"], dtype=np.float32)
+                if dims is None:
+                    dims = len(embedding)
+                elif len(embedding) != dims:
+                    logger.warning(f"Skipping {_decode(key)}: expected {dims} dims, found {len(embedding)}")
+                    continue
+
+                vectors.write(embedding.astype("<f4", copy=False).tobytes())
+                columns["chunk_id"].append(_decode(key)[len(keys.prefix):])
+                columns["file_id"].append(_decode(fields.get(b"file_id", b"")))
+                columns["filename"].append(_decode(fields.get(b"filename", b"")))
+                columns["content"].append(_decode(fields.get(b"content", b"")))
+                chunk_indexes.append(int(fields.get(b"chunk_index", 0)))
+                count += 1
+
+            batch.clear()
+            logger.info(f"Exported {count} chunks")
+
+        for key in client.scan_iter(match=f"{keys.prefix}*", count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+
+    for column in columns.values():
+        column.close()
+    np.save(os.path.join(path, "chunk_index.npy"), np.array(chunk_indexes, dtype=np.int32))
+
+    # Document metadata is small, so it is stored as plain JSON
+    redis_client = get_redis_client()
+    file_ids = sorted(redis_client.smembers(keys.documents_set))
+    pipeline = redis_client.pipeline(transaction=False)
+    for file_id in file_ids:
+        pipeline.hgetall(keys.document_key(file_id))
+    documents = [metadata for metadata in pipeline.execute() if metadata]
+    with open(os.path.join(path, "documents.json"), "w", encoding="utf-8") as file:
+        json.dump(documents, file)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "collection": collection,
+        "count": count,
+        "dims": dims or 0,
+        "dtype": "float32",
+        "documents": len(documents),
+        "created": datetime.now().isoformat()
+    }
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+
+    return {"chunks": count, "documents": len(documents)}
+
+def import_snapshot(path: str, collection: Optional[str] = None, batch_size: int = 1000) -> Dict[str, int]:
+    """Bulk-load a snapshot directory into a collection without generating embeddings"""
+    with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version: {manifest.get('format_version')}")
+
+    collection = validate_collection(collection or manifest["collection"])
+    keys = get_collection_keys(collection)
+    index = get_vector_index(collection)
+    count = manifest["count"]
+
+    # RediSearch silently skips hashes whose vector size doesn't match the index
+    index_dims = index.schema.fields["embedding"].attrs.dims
+    if count and manifest["dims"] != index_dims:
+        raise ValueError(
+            f"Snapshot vectors have {manifest['dims']} dims but index {index.name} expects {index_dims}"
+        )
+
+    if count:
+        vectors = np.memmap(os.path.join(path, "vectors.f32"), dtype="<f4", mode="r",
+                            shape=(count, manifest["dims"]))
+        columns = {name: StringColumnReader(path, name) for name in STRING_COLUMNS}
+        chunk_indexes = np.load(os.path.join(path, "chunk_index.npy"), mmap_mode="r")
+
+        for start in range(0, count, batch_size):
+            end = min(start + batch_size, count)
+            records = []
+            chunk_keys = []
+            for row in range(start, end):
+                chunk_id = columns["chunk_id"][row]
+                chunk_keys.append(keys.chunk_key(chunk_id))
+                records.append({
+                    "id": chunk_id,
+                    "file_id": columns["file_id"][row],
+                    "filename": columns["filename"][row],
+                    "content": columns["content"][row],
+                    "chunk_index": int(chunk_indexes[row]),
+                    "embedding": vectors[row].tobytes()
+                })
+
+            # SearchIndex.load writes through a pipeline in batches
+            index.load(records, keys=chunk_keys, batch_size=batch_size)
+            logger.info(f"Imported {end}/{count} chunks")
+
+    with open(os.path.join(path, "documents.json"), "r", encoding="utf-8") as file:
+        documents = json.load(file)
+
+    pipeline = get_redis_client().pipeline(transaction=False)
+    for metadata in documents:
+        pipeline.hset(keys.document_key(metadata["file_id"]), mapping=metadata)
+        pipeline.sadd(keys.documents_set, metadata["file_id"])
+    pipeline.execute()
+
+    return {"chunks": count, "documents": len(documents)}
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export or import a vector index snapshot")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write a collection to a snapshot directory")
+    export_parser.add_argument("path", help="Snapshot directory")
+    export_parser.add_argument("--collection", default=DEFAULT_COLLECTION, help="Collection to export")
+
+    import_parser = subparsers.add_parser("import", help="Load a snapshot directory into Redis")
+    import_parser.add_argument("path", help="Snapshot directory")
+    import_parser.add_argument("--collection", default=None,
+                               help="Target collection (defaults to the exported collection)")
+
+    for subparser in (export_parser, import_parser):
+        subparser.add_argument("--batch-size", type=int, default=1000, help="Keys per Redis pipeline")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    load_dotenv()
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    args = _parse_args(argv)
+    batch_size = max(1, args.batch_size)
+
+    started = time.monotonic()
+    try:
+        if args.command == "export":
+            stats = export_snapshot(args.path, validate_collection(args.collection), batch_size)
+        else:
+            stats = import_snapshot(args.path, args.collection, batch_size)
+    except Exception as e:
+        logger.error(f"Snapshot {args.command} failed: {e}")
+        return 1
+
+    logger.info(f"Snapshot {args.command} finished in {time.monotonic() - started:.1f}s: {stats}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
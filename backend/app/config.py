@@ -8,6 +8,7 @@ class Settings(BaseSettings):
     redis_host: str = os.getenv("REDIS_HOST", "localhost")
     redis_port: int = int(os.getenv("REDIS_PORT", "6379"))
     redis_password: str = os.getenv("REDIS_PASSWORD", "")
+    redis_cluster: bool = os.getenv("REDIS_CLUSTER", "false").lower() == "true"
     
 
     # Application Settings
@@ -33,6 +34,15 @@ class Settings(BaseSettings):
     embedding_model: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
     chunk_size: int = int(os.getenv("CHUNK_SIZE", "1000"))
     chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "200"))
+    snippet_size: int = int(os.getenv("SNIPPET_SIZE", "240"))
+
+    # Re-ranking Settings (requires sentence-transformers)
+    rerank_enabled: bool = os.getenv("RERANK_ENABLED", "false").lower() == "true"
+    rerank_model: str = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+    rerank_candidates: int = int(os.getenv("RERANK_CANDIDATES", "30"))
+    rerank_batch_size: int = int(os.getenv("RERANK_BATCH_SIZE", "32"))
+    rerank_timeout_ms: int = int(os.getenv("RERANK_TIMEOUT_MS", "300"))
+    rerank_max_queued: int = int(os.getenv("RERANK_MAX_QUEUED", "4"))
     
     class Config:
         env_file = ".env"
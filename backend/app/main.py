@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 
 from app.routers import documents, search, health
 from app.config import settings
+from app.services.rerank_service import get_rerank_service
 
 # Load environment variables
 load_dotenv()
@@ -16,6 +17,7 @@ logging.basicConfig(
     level=getattr(logging, settings.log_level.upper()),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
+logger = logging.getLogger(__name__)
 
 # Create FastAPI app
 app = FastAPI(
@@ -43,6 +45,16 @@ app.include_router(search.router, prefix="/api/search", tags=["search"])
 # Create uploads directory if it doesn't exist
 os.makedirs(settings.upload_dir, exist_ok=True)
 
+@app.on_event("startup")
+async def load_rerank_model():
+    """Load the cross-encoder up front so it never counts against a request's latency budget"""
+    if settings.rerank_enabled:
+        # Re-ranking is optional; searches fall back to vector order if the model can't load
+        try:
+            await get_rerank_service().load()
+        except Exception as e:
+            logger.error(f"Failed to load cross-encoder model, re-ranking disabled until it loads: {e}")
+
 @app.get("/")
 async def root():
     return {
@@ -8,6 +8,7 @@ class DocumentResponse(BaseModel):
     upload_date: datetime
     chunks_count: int
     status: str
+    collection: str = "default"
 
 class DocumentUploadResponse(BaseModel):
     file_id: str
@@ -15,6 +16,7 @@ class DocumentUploadResponse(BaseModel):
     status: str
     chunks_created: int
     message: str
+    collection: str = "default"
 
 class DocumentChunk(BaseModel):
     chunk_id: str
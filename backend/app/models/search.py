@@ -7,6 +7,9 @@ class SearchRequest(BaseModel):
     limit: int = Field(10, ge=1, le=50, description="Number of results to return")
     threshold: float = Field(0.7, ge=0.0, le=1.0, description="Similarity threshold")
     file_ids: Optional[List[str]] = Field(None, description="Specific file IDs to search within")
+    collections: Optional[List[str]] = Field(None, description="Collections to search (defaults to the default collection)")
+    rerank: Optional[bool] = Field(None, description="Re-rank candidates with the cross-encoder (defaults to RERANK_ENABLED)")
+    snippet: bool = Field(False, description="Return highlighted excerpts instead of full chunk content")
 
 class SearchResponse(BaseModel):
     chunk_id: str
@@ -15,3 +18,9 @@ class SearchResponse(BaseModel):
     content: str
     similarity_score: float
     chunk_index: int
+    collection: str = "default"
+    rerank_score: Optional[float] = None
+    snippet: bool = False
+    highlights: Optional[List[List[int]]] = Field(
+        None, description="[start, end) spans of matched query terms in content, in UTF-16 code units"
+    )
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Query
 from typing import List
 import os
 import uuid
 from app.services.document_service import DocumentService
+from app.services.redis_service import DEFAULT_COLLECTION, list_collections, validate_collection
 from app.models.document import DocumentResponse, DocumentUploadResponse
 
 router = APIRouter()
@@ -11,9 +12,11 @@ document_service = DocumentService()
 @router.post("/upload", response_model=DocumentUploadResponse)
 async def upload_document(
     file: UploadFile = File(...),
-    openai_api_key: str = Form(...)
+    openai_api_key: str = Form(...),
+    collection: str = Form(DEFAULT_COLLECTION)
 ):
     """Upload and process a document for vector search"""
+    collection = _validated(collection)
     try:
         # Validate file type
         allowed_types = ["application/pdf", "text/plain", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
@@ -39,7 +42,8 @@ async def upload_document(
             file_path=file_path,
             original_filename=file.filename,
             file_id=file_id,
-            openai_api_key=openai_api_key
+            openai_api_key=openai_api_key,
+            collection=collection
         )
         
         # Clean up temporary file
@@ -50,7 +54,8 @@ async def upload_document(
             filename=file.filename,
             status="processed",
             chunks_created=result["chunks_created"],
-            message="Document successfully processed and indexed"
+            message="Document successfully processed and indexed",
+            collection=collection
         )
         
     except Exception as e:
@@ -60,21 +65,38 @@ async def upload_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/", response_model=List[DocumentResponse])
-async def list_documents():
+async def list_documents(collection: str = Query(DEFAULT_COLLECTION, description="Collection to list")):
     """List all processed documents"""
+    collection = _validated(collection)
     try:
-        documents = await document_service.list_documents()
+        documents = await document_service.list_documents(collection)
         return documents
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/collections", response_model=List[str])
+async def get_collections():
+    """List all document collections"""
+    try:
+        return list_collections()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.delete("/{file_id}")
-async def delete_document(file_id: str):
+async def delete_document(file_id: str, collection: str = Query(DEFAULT_COLLECTION, description="Collection holding the document")):
     """Delete a document and its embeddings"""
+    collection = _validated(collection)
     try:
-        result = await document_service.delete_document(file_id)
+        result = await document_service.delete_document(file_id, collection)
         if not result:
             raise HTTPException(status_code=404, detail="Document not found")
         return {"message": "Document deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+def _validated(collection: str) -> str:
+    """Validate a collection name, rejecting bad input with a 400"""
+    try:
+        return validate_collection(collection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
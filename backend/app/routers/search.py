@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, List, Optional
+import json
 from app.services.search_service import SearchService
 from app.models.search import SearchRequest, SearchResponse
+from app.services.redis_service import validate_collection
 
 router = APIRouter()
 search_service = SearchService()
@@ -11,9 +14,13 @@ async def search_documents(
     query: str = Query(..., description="Search query"),
     openai_api_key: str = Query(..., description="OpenAI API key for generating query embeddings"),
     limit: int = Query(10, ge=1, le=50, description="Number of results to return"),
-    threshold: float = Query(0.7, ge=0.0, le=1.0, description="Similarity threshold")
+    threshold: float = Query(0.7, ge=0.0, le=1.0, description="Similarity threshold"),
+    rerank: Optional[bool] = Query(None, description="Re-rank candidates with the cross-encoder (defaults to RERANK_ENABLED)"),
+    snippet: bool = Query(False, description="Return highlighted excerpts instead of full chunk content"),
+    collections: Optional[List[str]] = Query(None, description="Collections to search (defaults to the default collection)")
 ):
     """Perform semantic search across all documents"""
+    _validate_collections(collections)
     try:
         if not query.strip():
             raise HTTPException(status_code=400, detail="Query cannot be empty")
@@ -23,7 +30,10 @@ async def search_documents(
             openai_api_key=openai_api_key,
             limit=limit,
             threshold=threshold,
-            file_ids=None
+            file_ids=None,
+            rerank=rerank,
+            snippet=snippet,
+            collections=collections
         )
         
         return results
@@ -34,6 +44,7 @@ async def search_documents(
 @router.post("/", response_model=List[SearchResponse])
 async def search_documents_post(request: SearchRequest):
     """Perform semantic search with POST request (for complex queries)"""
+    _validate_collections(request.collections)
     try:
         if not request.query.strip():
             raise HTTPException(status_code=400, detail="Query cannot be empty")
@@ -43,10 +54,82 @@ async def search_documents_post(request: SearchRequest):
             openai_api_key=request.openai_api_key,
             limit=request.limit,
             threshold=request.threshold,
-            file_ids=request.file_ids
+            file_ids=request.file_ids,
+            rerank=request.rerank,
+            snippet=request.snippet,
+            collections=request.collections
         )
         
         return results
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/stream")
+async def search_documents_stream(
+    request: Request,
+    query: str = Query(..., description="Search query"),
+    openai_api_key: str = Query(..., description="OpenAI API key for generating query embeddings"),
+    limit: int = Query(10, ge=1, le=50, description="Number of results to return"),
+    threshold: float = Query(0.7, ge=0.0, le=1.0, description="Similarity threshold"),
+    rerank: Optional[bool] = Query(None, description="Re-rank candidates with the cross-encoder (defaults to RERANK_ENABLED)"),
+    snippet: bool = Query(False, description="Return highlighted excerpts instead of full chunk content"),
+    collections: Optional[List[str]] = Query(None, description="Collections to search (defaults to the default collection)")
+):
+    """Stream semantic search results as NDJSON, or as SSE when requested via the Accept header"""
+    if not query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    _validate_collections(collections)
+
+    events = search_service.search_stream(
+        query=query.strip(),
+        openai_api_key=openai_api_key,
+        limit=limit,
+        threshold=threshold,
+        file_ids=None,
+        rerank=rerank,
+        snippet=snippet,
+        collections=collections
+    )
+    return _stream_response(events, request)
+
+@router.post("/stream")
+async def search_documents_stream_post(search_request: SearchRequest, request: Request):
+    """Stream semantic search results with POST request (for complex queries)"""
+    if not search_request.query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    _validate_collections(search_request.collections)
+
+    events = search_service.search_stream(
+        query=search_request.query.strip(),
+        openai_api_key=search_request.openai_api_key,
+        limit=search_request.limit,
+        threshold=search_request.threshold,
+        file_ids=search_request.file_ids,
+        rerank=search_request.rerank,
+        snippet=search_request.snippet,
+        collections=search_request.collections
+    )
+    return _stream_response(events, request)
+
+def _validate_collections(collections: Optional[List[str]]):
+    """Reject invalid collection names with a 400"""
+    try:
+        for collection in collections or []:
+            validate_collection(collection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _stream_response(events: AsyncIterator[Dict[str, Any]], request: Request) -> StreamingResponse:
+    """Serialize search events as Server-Sent Events or newline-delimited JSON"""
+    if "text/event-stream" in request.headers.get("accept", ""):
+        async def sse():
+            async for event in events:
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+        return StreamingResponse(sse(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+
+    async def ndjson():
+        async for event in events:
+            yield json.dumps(event) + "\n"
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import uuid
 from typing import List, Dict, Any
@@ -5,9 +6,10 @@ from datetime import datetime
 import PyPDF2
 import docx
 import numpy as np
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
-from app.services.redis_service import get_redis_client, get_vector_index
+from redisvl.index import SearchIndex
+from app.services.redis_service import DEFAULT_COLLECTION, get_redis_client, get_vector_index, get_collection_keys
 from app.models.document import DocumentResponse
 import logging
 
@@ -17,13 +19,14 @@ load_dotenv()
 logger = logging.getLogger(__name__)
 
 class DocumentService:
-    def __init__(self):
-        self.redis_client = get_redis_client()
-        self.vector_index = get_vector_index()
+    def __init__(self, connect: bool = True):
+        # Extraction-only instances (e.g. bulk ingest worker processes) skip Redis
+        self.redis_client = get_redis_client() if connect else None
         self.chunk_size = 1000  # Characters per chunk
         self.chunk_overlap = 200  # Overlap between chunks
     
-    async def process_document(self, file_path: str, original_filename: str, file_id: str, openai_api_key: str) -> Dict[str, Any]:
+    async def process_document(self, file_path: str, original_filename: str, file_id: str, openai_api_key: str,
+                               collection: str = DEFAULT_COLLECTION) -> Dict[str, Any]:
         """Process a document: extract text, create chunks, generate embeddings, and store in Redis"""
         try:
             # Extract text from document
@@ -47,7 +50,8 @@ class DocumentService:
                     filename=original_filename,
                     content=chunk,
                     chunk_index=i,
-                    embedding=embedding
+                    embedding=embedding,
+                    collection=collection
                 )
                 chunks_created += 1
             
@@ -55,7 +59,8 @@ class DocumentService:
             await self._store_document_metadata(
                 file_id=file_id,
                 filename=original_filename,
-                chunks_count=chunks_created
+                chunks_count=chunks_created,
+                collection=collection
             )
             
             logger.info(f"Processed document {original_filename} with {chunks_created} chunks")
@@ -144,29 +149,96 @@ class DocumentService:
             logger.error(f"Error generating embedding: {e}")
             raise
     
+    async def generate_embeddings(self, texts: List[str], openai_client: AsyncOpenAI) -> List[List[float]]:
+        """Generate embeddings for a batch of texts in a single OpenAI API call
+
+        The caller owns the client so bulk jobs can reuse one connection pool.
+        """
+        try:
+            response = await openai_client.embeddings.create(
+                model="text-embedding-3-small",
+                input=texts
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+        except Exception as e:
+            logger.error(f"Error generating batch embeddings: {e}")
+            raise
+
+    async def store_documents_batch(self, documents: List[Dict[str, Any]], collection: str = DEFAULT_COLLECTION):
+        """Store chunks and metadata for several documents using Redis pipelines
+
+        Each document is a dict with file_id, filename, chunks and embeddings.
+        The Redis writes run in a worker thread so the event loop is not blocked.
+        """
+        try:
+            # Resolve the index on the event loop; creating it is not thread-safe
+            vector_index = get_vector_index(collection)
+            await asyncio.to_thread(self._write_documents_batch, documents, collection, vector_index)
+        except Exception as e:
+            logger.error(f"Error storing batch of {len(documents)} documents: {e}")
+            raise
+
+    def _write_documents_batch(self, documents: List[Dict[str, Any]], collection: str,
+                              vector_index: SearchIndex):
+        """Blocking part of store_documents_batch"""
+        collection_keys = get_collection_keys(collection)
+        records = []
+        keys = []
+        for document in documents:
+            for i, (chunk, embedding) in enumerate(zip(document["chunks"], document["embeddings"])):
+                chunk_id = f"{document['file_id']}_{i}"
+                keys.append(collection_keys.chunk_key(chunk_id))
+                records.append({
+                    "id": chunk_id,
+                    "file_id": document["file_id"],
+                    "filename": document["filename"],
+                    "content": chunk,
+                    "chunk_index": i,
+                    "embedding": np.array(embedding, dtype=np.float32).tobytes()
+                })
+
+        # SearchIndex.load writes through a pipeline in batches
+        if records:
+            vector_index.load(records, keys=keys)
+
+        pipeline = self.redis_client.pipeline(transaction=False)
+        upload_date = datetime.now().isoformat()
+        for document in documents:
+            pipeline.hset(collection_keys.document_key(document["file_id"]), mapping={
+                "file_id": document["file_id"],
+                "filename": document["filename"],
+                "upload_date": upload_date,
+                "chunks_count": len(document["chunks"]),
+                "status": "processed"
+            })
+            pipeline.sadd(collection_keys.documents_set, document["file_id"])
+        pipeline.execute()
+
     async def _store_chunk(self, chunk_id: str, file_id: str, filename: str,
-                          content: str, chunk_index: int, embedding: List[float]):
+                          content: str, chunk_index: int, embedding: List[float],
+                          collection: str = DEFAULT_COLLECTION):
         """Store document chunk with embedding in Redis"""
         try:
             # Convert embedding to bytes for Hash storage in Redis
             # RedisVL requires vectors to be stored as byte strings for Hash storage
             embedding_bytes = np.array(embedding, dtype=np.float32).tobytes()
 
-            # Store in vector index
-            self.vector_index.load([{
+            # Store in vector index under the collection's key prefix
+            get_vector_index(collection).load([{
                 "id": chunk_id,
                 "file_id": file_id,
                 "filename": filename,
                 "content": content,
                 "chunk_index": chunk_index,
                 "embedding": embedding_bytes
-            }])
+            }], keys=[get_collection_keys(collection).chunk_key(chunk_id)])
 
         except Exception as e:
             logger.error(f"Error storing chunk {chunk_id}: {e}")
             raise
     
-    async def _store_document_metadata(self, file_id: str, filename: str, chunks_count: int):
+    async def _store_document_metadata(self, file_id: str, filename: str, chunks_count: int,
+                                       collection: str = DEFAULT_COLLECTION):
         """Store document metadata in Redis"""
         try:
             metadata = {
@@ -177,28 +249,31 @@ class DocumentService:
                 "status": "processed"
             }
             
-            self.redis_client.hset(f"document:{file_id}", mapping=metadata)
-            self.redis_client.sadd("documents", file_id)
+            keys = get_collection_keys(collection)
+            self.redis_client.hset(keys.document_key(file_id), mapping=metadata)
+            self.redis_client.sadd(keys.documents_set, file_id)
             
         except Exception as e:
             logger.error(f"Error storing document metadata for {file_id}: {e}")
             raise
     
-    async def list_documents(self) -> List[DocumentResponse]:
-        """List all processed documents"""
+    async def list_documents(self, collection: str = DEFAULT_COLLECTION) -> List[DocumentResponse]:
+        """List all processed documents in a collection"""
         try:
-            document_ids = self.redis_client.smembers("documents")
+            keys = get_collection_keys(collection)
+            document_ids = self.redis_client.smembers(keys.documents_set)
             documents = []
             
             for doc_id in document_ids:
-                metadata = self.redis_client.hgetall(f"document:{doc_id}")
+                metadata = self.redis_client.hgetall(keys.document_key(doc_id))
                 if metadata:
                     documents.append(DocumentResponse(
                         file_id=metadata["file_id"],
                         filename=metadata["filename"],
                         upload_date=datetime.fromisoformat(metadata["upload_date"]),
                         chunks_count=int(metadata["chunks_count"]),
-                        status=metadata["status"]
+                        status=metadata["status"],
+                        collection=collection
                     ))
             
             return sorted(documents, key=lambda x: x.upload_date, reverse=True)
@@ -207,15 +282,17 @@ class DocumentService:
             logger.error(f"Error listing documents: {e}")
             raise
     
-    async def delete_document(self, file_id: str) -> bool:
+    async def delete_document(self, file_id: str, collection: str = DEFAULT_COLLECTION) -> bool:
         """Delete a document and all its chunks"""
         try:
+            keys = get_collection_keys(collection)
+
             # Check if document exists
-            if not self.redis_client.sismember("documents", file_id):
+            if not self.redis_client.sismember(keys.documents_set, file_id):
                 return False
             
             # Get document metadata to find chunk count
-            metadata = self.redis_client.hgetall(f"document:{file_id}")
+            metadata = self.redis_client.hgetall(keys.document_key(file_id))
             if not metadata:
                 return False
             
@@ -225,13 +302,13 @@ class DocumentService:
             chunk_ids = [f"{file_id}_{i}" for i in range(chunks_count)]
             for chunk_id in chunk_ids:
                 try:
-                    self.redis_client.delete(f"doc:{chunk_id}")
+                    self.redis_client.delete(keys.chunk_key(chunk_id))
                 except:
                     pass  # Continue even if some chunks don't exist
             
             # Delete document metadata
-            self.redis_client.delete(f"document:{file_id}")
-            self.redis_client.srem("documents", file_id)
+            self.redis_client.delete(keys.document_key(file_id))
+            self.redis_client.srem(keys.documents_set, file_id)
             
             logger.info(f"Deleted document {file_id} with {chunks_count} chunks")
             return True
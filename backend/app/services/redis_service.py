@@ -1,24 +1,77 @@
 import os
+import re
 import redis
+from dataclasses import dataclass
+from redis.cluster import RedisCluster
 from redisvl.index import SearchIndex
 from redisvl.query import VectorQuery
-from typing import Optional
+from typing import Dict, List, Optional
+from app.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_COLLECTION = "default"
+COLLECTIONS_KEY = "collections"
+_COLLECTION_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+@dataclass(frozen=True)
+class CollectionKeys:
+    """Index and key names for one collection (tenant)
+
+    Named collections wrap the collection name in a hash tag so all of their
+    keys map to the same Redis Cluster slot, keeping pipelines and the
+    per-collection index on one shard. Outside cluster mode the default
+    collection keeps the original un-tagged names.
+    """
+    collection: str
+    index_name: str
+    prefix: str
+    documents_set: str
+    metadata_prefix: str
+
+    @classmethod
+    def for_collection(cls, collection: str) -> "CollectionKeys":
+        if collection == DEFAULT_COLLECTION and not settings.redis_cluster:
+            return cls(collection, "document_embeddings", "doc:", "documents", "document:")
+        # Leading hash tag keeps these keys clear of the default "doc:" index prefix
+        tag = f"{{{collection}}}"
+        return cls(
+            collection,
+            f"document_embeddings_{collection}",
+            f"{tag}:doc:",
+            f"{tag}:documents",
+            f"{tag}:document:"
+        )
+
+    def chunk_key(self, chunk_id: str) -> str:
+        return f"{self.prefix}{chunk_id}"
+
+    def document_key(self, file_id: str) -> str:
+        return f"{self.metadata_prefix}{file_id}"
+
+def validate_collection(collection: Optional[str]) -> str:
+    """Return a usable collection name, raising ValueError for invalid ones"""
+    collection = collection or DEFAULT_COLLECTION
+    if not _COLLECTION_NAME.match(collection):
+        raise ValueError(f"Invalid collection name: {collection!r} (use letters, digits, '-' and '_')")
+    return collection
+
 class RedisService:
     def __init__(self):
         self.client: Optional[redis.Redis] = None
-        self.index: Optional[SearchIndex] = None
+        self.indexes: Dict[str, SearchIndex] = {}
+        self.binary_client: Optional[redis.Redis] = None
         self._connect()
     
     def _connect(self):
         """Initialize Redis connection and vector index"""
         try:
             # Get Redis connection details from environment
-            redis_url = os.getenv("REDIS_URL")
-            if redis_url:
+            redis_url = self._redis_url()
+            if settings.redis_cluster:
+                self.client = RedisCluster.from_url(redis_url, decode_responses=True)
+            elif os.getenv("REDIS_URL"):
                 self.client = redis.from_url(redis_url, decode_responses=True)
             else:
                 self.client = redis.Redis(
@@ -33,20 +86,35 @@ class RedisService:
             logger.info("Successfully connected to Redis")
             
             # Initialize vector index
-            self._setup_vector_index()
+            self._setup_vector_index(DEFAULT_COLLECTION)
             
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
+
+    def _redis_url(self) -> str:
+        """Create Redis URL - ensure proper format for RedisVL"""
+        redis_url = os.getenv("REDIS_URL")
+        if not redis_url:
+            host = os.getenv('REDIS_HOST', 'localhost')
+            port = os.getenv('REDIS_PORT', '6379')
+            password = os.getenv('REDIS_PASSWORD', '')
+            if password:
+                redis_url = f"redis://default:{password}@{host}:{port}"
+            else:
+                redis_url = f"redis://{host}:{port}"
+        return redis_url
     
-    def _setup_vector_index(self):
-        """Set up the vector index for document embeddings"""
+    def _setup_vector_index(self, collection: str) -> SearchIndex:
+        """Set up the vector index for a collection's document embeddings"""
         try:
+            keys = CollectionKeys.for_collection(collection)
+
             # Define the index schema
             schema = {
                 "index": {
-                    "name": "document_embeddings",
-                    "prefix": "doc:",
+                    "name": keys.index_name,
+                    "prefix": keys.prefix,
                     "storage_type": "hash"
                 },
                 "fields": [
@@ -79,32 +147,25 @@ class RedisService:
                 ]
             }
 
-            # Create Redis URL - ensure proper format for RedisVL
-            redis_url = os.getenv("REDIS_URL")
-            if not redis_url:
-                host = os.getenv('REDIS_HOST', 'localhost')
-                port = os.getenv('REDIS_PORT', '6379')
-                password = os.getenv('REDIS_PASSWORD', '')
-                if password:
-                    redis_url = f"redis://default:{password}@{host}:{port}"
-                else:
-                    redis_url = f"redis://{host}:{port}"
+            logger.info(f"Creating SearchIndex {keys.index_name}")
 
-            logger.info(f"Creating SearchIndex with URL: {redis_url[:30]}...")
-
-            # Create or get existing index
-            self.index = SearchIndex.from_dict(schema, redis_url=redis_url)
+            # Create or get existing index on the shared connection for its node
+            index = SearchIndex.from_dict(schema, redis_client=self._index_client(collection))
 
             # Create index if it doesn't exist
             try:
-                self.index.create(overwrite=False)
-                logger.info("Vector index created successfully")
+                index.create(overwrite=False)
+                logger.info(f"Vector index {keys.index_name} created successfully")
             except Exception as e:
                 if "Index already exists" in str(e):
-                    logger.info("Vector index already exists")
+                    logger.info(f"Vector index {keys.index_name} already exists")
                 else:
                     raise
 
+            self.client.sadd(COLLECTIONS_KEY, collection)
+            self.indexes[collection] = index
+            return index
+
         except Exception as e:
             logger.error(f"Failed to setup vector index: {e}")
             raise
@@ -115,11 +176,39 @@ class RedisService:
             self._connect()
         return self.client
     
-    def get_index(self) -> SearchIndex:
-        """Get vector index instance"""
-        if not self.index:
-            self._setup_vector_index()
-        return self.index
+    def get_binary_client(self) -> redis.Redis:
+        """Get a Redis client that returns raw bytes (needed to read vector fields)"""
+        if not self.binary_client:
+            if settings.redis_cluster:
+                self.binary_client = RedisCluster.from_url(self._redis_url())
+            else:
+                self.binary_client = redis.from_url(self._redis_url())
+        return self.binary_client
+
+    def _index_client(self, collection: str) -> redis.Redis:
+        """Connection a collection's index should use
+
+        On an OSS cluster, RediSearch only indexes keys on its own shard and
+        redis-py sends keyless FT.* commands to the default node. The index is
+        therefore bound to the node owning the collection's hash slot, reusing
+        that node's connection from the shared cluster client. The mapping is
+        resolved once, so restart the app after resharding a collection's slot.
+        """
+        client = self.get_binary_client()
+        if settings.redis_cluster:
+            return client.get_node_from_key(f"{{{collection}}}").redis_connection
+        return client
+
+    def get_index(self, collection: str = DEFAULT_COLLECTION) -> SearchIndex:
+        """Get vector index instance for a collection, creating it on first use"""
+        collection = validate_collection(collection)
+        if collection not in self.indexes:
+            self._setup_vector_index(collection)
+        return self.indexes[collection]
+
+    def list_collections(self) -> List[str]:
+        """List collections that have a vector index"""
+        return sorted(self.get_client().smembers(COLLECTIONS_KEY))
 
 # Global Redis service instance
 _redis_service = None
@@ -135,6 +224,18 @@ def get_redis_client() -> redis.Redis:
     """Get Redis client"""
     return get_redis_service().get_client()
 
-def get_vector_index() -> SearchIndex:
+def get_binary_redis_client() -> redis.Redis:
+    """Get Redis client without response decoding"""
+    return get_redis_service().get_binary_client()
+
+def get_vector_index(collection: str = DEFAULT_COLLECTION) -> SearchIndex:
     """Get vector index"""
-    return get_redis_service().get_index()
+    return get_redis_service().get_index(collection)
+
+def get_collection_keys(collection: str = DEFAULT_COLLECTION) -> CollectionKeys:
+    """Get index and key names for a collection"""
+    return CollectionKeys.for_collection(validate_collection(collection))
+
+def list_collections() -> List[str]:
+    """List known collections"""
+    return get_redis_service().list_collections()
@@ -0,0 +1,107 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Set
+from app.config import settings
+from app.models.search import SearchResponse
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from sentence_transformers import CrossEncoder
+except ImportError:  # Re-ranking is optional
+    CrossEncoder = None
+
+class RerankService:
+    def __init__(self):
+        self.model_name = settings.rerank_model
+        self.batch_size = settings.rerank_batch_size
+        self.timeout = settings.rerank_timeout_ms / 1000.0
+        self.max_queued = settings.rerank_max_queued
+        self._model = None
+        # One dedicated worker keeps scoring off the shared default executor
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+        self._loading: Optional[Future] = None
+        self._jobs: Set[Future] = set()
+        self._abandoned: Set[Future] = set()
+
+    @property
+    def available(self) -> bool:
+        """Whether a cross-encoder backend is installed"""
+        return CrossEncoder is not None
+
+    async def load(self):
+        """Load the cross-encoder on the re-rank worker (called at startup)"""
+        if self.available and self._model is None:
+            await asyncio.wrap_future(self._start_loading())
+
+    async def rerank(self, query: str, results: List[SearchResponse]) -> List[SearchResponse]:
+        """Re-score candidates with the cross-encoder, keeping vector order if the latency budget is exceeded"""
+        if not results or not self.available:
+            return results
+
+        # Never load inside the latency budget; start loading and skip this request
+        if self._model is None:
+            logger.warning("Cross-encoder not loaded yet, using vector order")
+            self._start_loading()
+            return results
+
+        self._jobs = {job for job in self._jobs if not job.done()}
+        self._abandoned = {job for job in self._abandoned if not job.done()}
+
+        # A job whose caller already timed out is still occupying the worker
+        if self._abandoned:
+            logger.warning("Re-rank worker still running a timed-out job, using vector order")
+            return results
+        if len(self._jobs) >= self.max_queued:
+            logger.warning("Re-rank queue full, using vector order")
+            return results
+
+        job = self._executor.submit(self._score, query, [r.content for r in results])
+        self._jobs.add(job)
+        try:
+            # Queued requests wait behind the worker within their own budget
+            scores = await asyncio.wait_for(asyncio.wrap_future(job), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # Cancelling drops a job that hasn't started; a running one can't be stopped
+            if not job.cancel():
+                self._abandoned.add(job)
+            logger.warning(f"Re-ranking exceeded {self.timeout * 1000:.0f}ms budget, using vector order")
+            return results
+        except Exception as e:
+            logger.error(f"Error re-ranking results, using vector order: {e}")
+            return results
+
+        for result, score in zip(results, scores):
+            result.rerank_score = float(score)
+
+        return sorted(results, key=lambda x: x.rerank_score, reverse=True)
+
+    def _start_loading(self) -> Future:
+        if self._loading is None or self._loading.done():
+            self._loading = self._executor.submit(self._load_model)
+        return self._loading
+
+    def _score(self, query: str, passages: List[str]) -> List[float]:
+        """Score (query, passage) pairs in a single batched call"""
+        pairs = [(query, passage) for passage in passages]
+        return self._model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False).tolist()
+
+    def _load_model(self):
+        if self._model is None:
+            logger.info(f"Loading cross-encoder model {self.model_name}")
+            try:
+                self._model = CrossEncoder(self.model_name, device="cpu")
+            except Exception as e:
+                logger.error(f"Error loading cross-encoder model {self.model_name}: {e}")
+                raise
+
+# Global re-rank service instance
+_rerank_service: Optional[RerankService] = None
+
+def get_rerank_service() -> RerankService:
+    """Get or create re-rank service singleton"""
+    global _rerank_service
+    if _rerank_service is None:
+        _rerank_service = RerankService()
+    return _rerank_service
@@ -1,8 +1,13 @@
+import asyncio
+import heapq
 import os
-from typing import List, Optional
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from openai import OpenAI
 from redisvl.query import VectorQuery
-from app.services.redis_service import get_vector_index
+from app.config import settings
+from app.services.redis_service import DEFAULT_COLLECTION, get_vector_index, list_collections, validate_collection
+from app.services.rerank_service import get_rerank_service
 from app.models.search import SearchResponse
 import logging
 
@@ -10,60 +15,208 @@ logger = logging.getLogger(__name__)
 
 class SearchService:
     def __init__(self):
-        self.vector_index = get_vector_index()
-    
+        self.rerank_service = get_rerank_service()
+        self._rerank_unavailable_warned = False
+        self.snippet_size = settings.snippet_size
+
     async def search(self, query: str, openai_api_key: str, limit: int = 10, threshold: float = 0.7,
-                    file_ids: Optional[List[str]] = None) -> List[SearchResponse]:
+                    file_ids: Optional[List[str]] = None, rerank: Optional[bool] = None,
+                    snippet: bool = False, collections: Optional[List[str]] = None) -> List[SearchResponse]:
         """Perform semantic search across documents"""
         try:
-            # Generate embedding for the query
-            query_embedding = await self._generate_query_embedding(query, openai_api_key)
-            
-            # Create vector query
-            vector_query = VectorQuery(
-                vector=query_embedding,
-                vector_field_name="embedding",
-                return_fields=["file_id", "filename", "content", "chunk_index"],
-                num_results=limit
-            )
-            
-            # Add file filter if specified
-            if file_ids:
-                file_filter = " | ".join([f"@file_id:{{{file_id}}}" for file_id in file_ids])
-                vector_query = vector_query.filter(file_filter)
-            
-            # Execute search
-            results = self.vector_index.query(vector_query)
-            
-            # Process and filter results
-            search_results = []
-            for result in results:
-                # RedisVL uses 'vector_distance' field, convert to similarity score
-                # Lower distance = higher similarity, so we convert: similarity = 1 - distance
-                vector_distance = float(result.get("vector_distance", 1.0))
-                similarity_score = 1.0 - vector_distance
-
-                # Apply similarity threshold
-                if similarity_score >= threshold:
-                    search_results.append(SearchResponse(
-                        chunk_id=result["id"],
-                        file_id=result["file_id"],
-                        filename=result["filename"],
-                        content=result["content"],
-                        similarity_score=similarity_score,
-                        chunk_index=int(result["chunk_index"])
-                    ))
-            
-            # Sort by similarity score (descending)
-            search_results.sort(key=lambda x: x.similarity_score, reverse=True)
-            
+            rerank = self._use_rerank(rerank)
+
+            # Fetch a wider candidate pool when a re-rank stage follows
+            num_results = max(limit, settings.rerank_candidates) if rerank else limit
+
+            search_results = await self._vector_search(query, openai_api_key, num_results, threshold, file_ids,
+                                                       collections)
+
+            # Re-score the top candidates with the cross-encoder
+            if rerank:
+                search_results = await self.rerank_service.rerank(query, search_results)
+            search_results = search_results[:limit]
+
+            if snippet:
+                search_results = [self._to_snippet(result, query) for result in search_results]
+
             logger.info(f"Search query '{query}' returned {len(search_results)} results")
             return search_results
-            
+
         except Exception as e:
             logger.error(f"Error performing search: {e}")
             raise
-    
+
+    async def search_stream(self, query: str, openai_api_key: str, limit: int = 10, threshold: float = 0.7,
+                           file_ids: Optional[List[str]] = None, rerank: Optional[bool] = None,
+                           snippet: bool = False, collections: Optional[List[str]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Perform semantic search, yielding events as each stage produces results"""
+        try:
+            rerank = self._use_rerank(rerank)
+            num_results = max(limit, settings.rerank_candidates) if rerank else limit
+
+            candidates = await self._vector_search(query, openai_api_key, num_results, threshold, file_ids,
+                                                   collections)
+
+            # Vector-order results are sent right away, one event per result
+            for result in candidates[:limit]:
+                yield {
+                    "event": "result",
+                    "stage": "vector",
+                    "data": self._project(result, query, snippet).model_dump()
+                }
+
+            # The re-rank stage replaces the ranking once it finishes
+            if rerank and candidates:
+                reranked = (await self.rerank_service.rerank(query, candidates))[:limit]
+                yield {
+                    "event": "results",
+                    "stage": "rerank",
+                    "data": [self._project(result, query, snippet).model_dump() for result in reranked]
+                }
+
+            yield {"event": "done", "count": min(len(candidates), limit)}
+            logger.info(f"Streamed search query '{query}' with {min(len(candidates), limit)} results")
+
+        except Exception as e:
+            logger.error(f"Error performing streaming search: {e}")
+            yield {"event": "error", "detail": str(e)}
+
+    def _use_rerank(self, rerank: Optional[bool]) -> bool:
+        """Resolve the per-request re-rank flag against settings and availability"""
+        if rerank is None:
+            rerank = settings.rerank_enabled
+        if rerank and not self.rerank_service.available:
+            if not self._rerank_unavailable_warned:
+                logger.warning("Re-ranking requested but sentence-transformers is not installed, using vector order")
+                self._rerank_unavailable_warned = True
+            return False
+        return bool(rerank)
+
+    async def _vector_search(self, query: str, openai_api_key: str, num_results: int, threshold: float,
+                            file_ids: Optional[List[str]],
+                            collections: Optional[List[str]] = None) -> List[SearchResponse]:
+        """Run the KNN query against each collection and return the merged top results, best first"""
+        collections = self._resolve_collections(collections)
+        if not collections:
+            return []
+
+        # Generate embedding for the query
+        query_embedding = await self._generate_query_embedding(query, openai_api_key)
+
+        # Create vector query
+        vector_query = VectorQuery(
+            vector=query_embedding,
+            vector_field_name="embedding",
+            return_fields=["file_id", "filename", "content", "chunk_index"],
+            num_results=num_results
+        )
+
+        # Add file filter if specified
+        if file_ids:
+            file_filter = " | ".join([f"@file_id:{{{file_id}}}" for file_id in file_ids])
+            vector_query = vector_query.filter(file_filter)
+
+        # Execute search, scattering across collection indexes (one shard each in cluster mode)
+        indexes = [get_vector_index(collection) for collection in collections]
+        if len(indexes) == 1:
+            results_per_collection = [indexes[0].query(vector_query)]
+        else:
+            results_per_collection = await asyncio.gather(
+                *(asyncio.to_thread(index.query, vector_query) for index in indexes)
+            )
+
+        # Process and filter results
+        search_results = []
+        for collection, results in zip(collections, results_per_collection):
+            search_results.extend(self._to_responses(results, threshold, collection))
+
+        # Merge into a single top-k ordered by similarity score (descending)
+        return heapq.nlargest(num_results, search_results, key=lambda x: x.similarity_score)
+
+    def _resolve_collections(self, collections: Optional[List[str]]) -> List[str]:
+        """Validate requested collections, skipping ones that have no index"""
+        requested = [validate_collection(c) for c in dict.fromkeys(collections or [DEFAULT_COLLECTION])]
+        known = set(list_collections())
+        for collection in requested:
+            if collection not in known:
+                logger.warning(f"Skipping unknown collection {collection}")
+        return [collection for collection in requested if collection in known]
+
+    def _to_responses(self, results: List[Dict[str, Any]], threshold: float, collection: str) -> List[SearchResponse]:
+        """Convert raw index results above the threshold into responses"""
+        search_results = []
+        for result in results:
+            # RedisVL uses 'vector_distance' field, convert to similarity score
+            # Lower distance = higher similarity, so we convert: similarity = 1 - distance
+            vector_distance = float(result.get("vector_distance", 1.0))
+            similarity_score = 1.0 - vector_distance
+
+            # Apply similarity threshold
+            if similarity_score >= threshold:
+                search_results.append(SearchResponse(
+                    chunk_id=result["id"],
+                    file_id=result["file_id"],
+                    filename=result["filename"],
+                    content=result["content"],
+                    similarity_score=similarity_score,
+                    chunk_index=int(result["chunk_index"]),
+                    collection=collection
+                ))
+        return search_results
+
+    def _project(self, result: SearchResponse, query: str, snippet: bool) -> SearchResponse:
+        """Apply the snippet projection if requested"""
+        return self._to_snippet(result, query) if snippet else result
+
+    def _to_snippet(self, result: SearchResponse, query: str) -> SearchResponse:
+        """Replace the chunk content with a highlighted excerpt around the query terms"""
+        content = result.content
+        spans = self._match_spans(content, query)
+
+        # Center the excerpt on the first matched term
+        if len(content) <= self.snippet_size:
+            start, end = 0, len(content)
+        else:
+            anchor = spans[0][0] if spans else 0
+            start = max(0, min(anchor - self.snippet_size // 4, len(content) - self.snippet_size))
+            end = start + self.snippet_size
+
+            # Snap to word boundaries
+            if start > 0:
+                space = content.find(' ', start)
+                if 0 <= space < end:
+                    start = space + 1
+            if end < len(content):
+                space = content.rfind(' ', start, end)
+                if space > start:
+                    end = space
+
+        prefix = "..." if start > 0 else ""
+        suffix = "..." if end < len(content) else ""
+        excerpt = prefix + content[start:end] + suffix
+
+        # Offsets are in UTF-16 code units so browsers can apply them with String.slice
+        highlights = [
+            [self._utf16_offset(excerpt, s - start + len(prefix)), self._utf16_offset(excerpt, e - start + len(prefix))]
+            for s, e in spans
+            if s >= start and e <= end
+        ]
+
+        return result.model_copy(update={"content": excerpt, "highlights": highlights, "snippet": True})
+
+    def _utf16_offset(self, text: str, index: int) -> int:
+        """Convert a code point index into a UTF-16 code unit offset"""
+        return len(text[:index].encode("utf-16-le")) // 2
+
+    def _match_spans(self, text: str, query: str) -> List[Tuple[int, int]]:
+        """Find character spans of query terms in the text"""
+        terms = [re.escape(term) for term in query.split() if len(term) > 2]
+        if not terms:
+            return []
+        pattern = re.compile(r"\b(" + "|".join(terms) + r")\w*", re.IGNORECASE)
+        return [match.span() for match in pattern.finditer(text)]
+
     async def _generate_query_embedding(self, query: str, openai_api_key: str) -> List[float]:
         """Generate embedding for search query"""
         try:
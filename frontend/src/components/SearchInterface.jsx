@@ -1,6 +1,5 @@
 import { useState, useEffect } from 'react'
 import { Search, FileText, Zap, AlertCircle } from 'lucide-react'
-import axios from 'axios'
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000'
 
@@ -11,7 +10,8 @@ const SearchInterface = ({ apiKey }) => {
   const [error, setError] = useState('')
   const [searchParams, setSearchParams] = useState({
     limit: 10,
-    threshold: 0.7
+    threshold: 0.7,
+    snippet: true
   })
 
   const performSearch = async (searchQuery = query) => {
@@ -29,18 +29,51 @@ const SearchInterface = ({ apiKey }) => {
     setError('')
 
     try {
-      const response = await axios.get(`${API_BASE_URL}/api/search/`, {
-        params: {
-          query: searchQuery.trim(),
-          openai_api_key: apiKey,
-          limit: searchParams.limit,
-          threshold: searchParams.threshold
-        }
+      const params = new URLSearchParams({
+        query: searchQuery.trim(),
+        openai_api_key: apiKey,
+        limit: searchParams.limit,
+        threshold: searchParams.threshold,
+        snippet: searchParams.snippet
+      })
+      const response = await fetch(`${API_BASE_URL}/api/search/stream?${params}`, {
+        headers: { Accept: 'application/x-ndjson' }
       })
 
-      setResults(response.data)
+      if (!response.ok) {
+        const body = await response.json().catch(() => ({}))
+        throw new Error(body.detail || 'Search failed. Please try again.')
+      }
+
+      // Render results as each NDJSON event arrives
+      setResults([])
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+
+        buffer += decoder.decode(value, { stream: true })
+        const lines = buffer.split('\n')
+        buffer = lines.pop()
+
+        for (const line of lines) {
+          if (!line.trim()) continue
+          const event = JSON.parse(line)
+
+          if (event.event === 'result') {
+            setResults(prev => [...prev, event.data])
+          } else if (event.event === 'results') {
+            setResults(event.data)
+          } else if (event.event === 'error') {
+            throw new Error(event.detail)
+          }
+        }
+      }
     } catch (err) {
-      setError(err.response?.data?.detail || 'Search failed. Please try again.')
+      setError(err.message || 'Search failed. Please try again.')
       setResults([])
     } finally {
       setLoading(false)
@@ -56,6 +89,24 @@ const SearchInterface = ({ apiKey }) => {
     setQuery(e.target.value)
   }
 
+  const highlightSpans = (text, spans) => {
+    const parts = []
+    let last = 0
+
+    spans.forEach(([start, end], index) => {
+      if (start > last) parts.push(text.slice(last, start))
+      parts.push(
+        <mark key={index} className="bg-yellow-200 px-1 rounded">
+          {text.slice(start, end)}
+        </mark>
+      )
+      last = end
+    })
+    parts.push(text.slice(last))
+
+    return parts
+  }
+
   const highlightText = (text, query) => {
     if (!query.trim()) return text
     
@@ -133,6 +184,16 @@ const SearchInterface = ({ apiKey }) => {
                   <option value={0.9}>90%</option>
                 </select>
               </div>
+
+              <label className="flex items-center space-x-2 text-sm font-medium text-gray-700">
+                <input
+                  type="checkbox"
+                  checked={searchParams.snippet}
+                  onChange={(e) => setSearchParams(prev => ({ ...prev, snippet: e.target.checked }))}
+                  className="rounded border-gray-300"
+                />
+                <span>Snippets only</span>
+              </label>
             </div>
             
             <button
@@ -196,7 +257,9 @@ const SearchInterface = ({ apiKey }) => {
                 
                 <div className="prose prose-sm max-w-none">
                   <p className="text-gray-700 leading-relaxed">
-                    {highlightText(result.content, query)}
+                    {result.highlights
+                      ? highlightSpans(result.content, result.highlights)
+                      : highlightText(result.content, query)}
                   </p>
                 </div>
               </div>